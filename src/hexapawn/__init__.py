@@ -1,194 +1,439 @@
 """Python Hexapawn library for playing and move generation"""
 
 from dataclasses import dataclass
-from enum import Enum
-from itertools import product
-import re
-from typing import Iterator, Optional, TypeAlias, Self
+import random
+from typing import Iterator, TypeAlias, Self
 
-Color: TypeAlias = bool
-WHITE: Color = True
-BLACK: Color = False
+Color: TypeAlias = int
+WHITE: Color = 1
+BLACK: Color = 0
 
+Value: TypeAlias = int
+WIN: Value = 1
+LOSS: Value = -1
 
-class Squares(Enum):
-    """All squares of the board"""
-    A1 = (0, 0)
-    A2 = (0, 1)
-    A3 = (0, 2)
-    B1 = (1, 0)
-    B2 = (1, 1)
-    B3 = (1, 2)
-    C1 = (2, 0)
-    C2 = (2, 1)
-    C3 = (2, 2)
-
-    @staticmethod
-    def _advance_rank(coords: tuple[int, int], player_color: Color) -> tuple[int, int] | None:
-        # Gets the coordinate tuple of the square a pawn of `player_color` would advance to without capturing
-        new_coords = (
-            coords[0],
-            coords[1] + (1 if player_color == WHITE else -1)
-        )
-
-        if new_coords[1] < 0 or new_coords[1] > 2:
-            return None
 
-        return new_coords
+class Square:
+    """Square of the board"""
 
-    @staticmethod
-    def _change_file(coords: tuple[int, int], left: bool = True) -> tuple[int, int] | None:
-        # Changes the file of a coordinate tuple according to the direction specified. Left means towards a file.
-        new_coords = (
-            coords[0] + (-1 if left else 1),
-            coords[1]
-        )
+    __slots__ = ("name", "file", "rank", "idx", "bit")
 
-        if new_coords[0] < 0 or new_coords[0] > 2:
-            return None
+    def __init__(self, name: str, file: int, rank: int):
+        self.name: str = name
+        """Name of the square, e.g. `A1`"""
+
+        self.file: int = file
+        """Index of the file of the square, starting at 0 for the a file"""
+
+        self.rank: int = rank
+        """Index of the rank of the square, starting at 0 for the first rank"""
+
+        self.idx: int = file * 3 + rank
+        """Index of the square on a bitboard"""
 
-        return new_coords
+        self.bit: int = 1 << self.idx
+        """Single-bit mask of the square on a bitboard"""
+
+    def __repr__(self) -> str:
+        return f"Squares.{self.name}"
+
+    def __reduce__(self) -> tuple:
+        # squares are singletons, so copies and unpickled squares have to resolve to the members of `Squares`
+        return getattr, (Squares, self.name)
+
+    @property
+    def value(self) -> tuple[int, int]:
+        """Coordinate tuple `(file, rank)` of the square"""
+        return self.file, self.rank
 
     def can_advance_to(self, target_square: Self, player_color: Color) -> bool:
         """Checks if the player of `player_color` could advance a piece from the current square to `target_square` in a
         non-capturing move."""
-        source_file, source_rank = self.value
-        target_file, target_rank = target_square.value
+        return bool(ADVANCE_BB[player_color][self.idx] & target_square.bit)
 
-        if source_file != target_file:
-            return False
+    def capture_candidates(self, player_color: Color) -> int:
+        """Gets the bitboard of squares that a pawn could capture at, given its `player_color`,
+        if there is an opponent pawn on the target square.
+
+        Use :func:`iter_squares` to iterate the squares of the bitboard."""
+        return CAPTURE_BB[player_color][self.idx]
+
+
+class _SquaresMeta(type):
+    # Makes the `Squares` namespace iterable like an enum, without the attribute access overhead of `Enum`
+
+    def __iter__(cls) -> Iterator[Square]:
+        return iter(SQ_BY_IDX)
+
+    def __len__(cls) -> int:
+        return len(SQ_BY_IDX)
+
+
+class Squares(metaclass=_SquaresMeta):  # pylint: disable=too-few-public-methods
+    """All squares of the board"""
+    A1 = Square("A1", 0, 0)
+    A2 = Square("A2", 0, 1)
+    A3 = Square("A3", 0, 2)
+    B1 = Square("B1", 1, 0)
+    B2 = Square("B2", 1, 1)
+    B3 = Square("B3", 1, 2)
+    C1 = Square("C1", 2, 0)
+    C2 = Square("C2", 2, 1)
+    C3 = Square("C3", 2, 2)
+
+
+# squares ordered by their index on a bitboard
+SQ_BY_IDX: tuple[Square, ...] = tuple(sorted(
+    (square for square in vars(Squares).values() if isinstance(square, Square)),
+    key=lambda square: square.idx,
+))
+
+# squares by their coordinate tuple
+SQ_BY_COORDS: dict[tuple[int, int], Square] = {square.value: square for square in SQ_BY_IDX}
 
-        delta_rank = +1 if player_color == WHITE else -1
-        return source_rank + delta_rank == target_rank
+# squares by their name in UCI notation
+SQUARE_BY_UCI: dict[str, Square] = {square.name.lower(): square for square in SQ_BY_IDX}
 
-    def capture_candidates(self, player_color: Color) -> set[Self]:
-        """Gets the squares that a pawn could capture at, given its `player_color`,
-        if there is an opponent pawn on the target square."""
-        if (rank_advanced_coords := self._advance_rank(self.value, player_color)) is None:
-            return set()
 
-        candidate_coords = [coords for left in [True, False]
-                            if (coords := self._change_file(rank_advanced_coords, left))]
-        assert len(candidate_coords) > 0, "There is always at least a file to the left or right"
+def iter_bits(bitboard: int) -> Iterator[int]:
+    """Iterates the indices of the bits that are set on the given `bitboard`, starting with the least significant"""
+    while bitboard:
+        lsb = bitboard & -bitboard
+        yield lsb.bit_length() - 1
+        bitboard ^= lsb
 
-        return {self.__class__(coords) for coords in candidate_coords}
 
+def iter_squares(bitboard: int) -> Iterator[Square]:
+    """Iterates the squares that are set on the given `bitboard`"""
+    return map(SQ_BY_IDX.__getitem__, iter_bits(bitboard))
 
-@dataclass
+
+# bitboards of the first and last rank
+RANK_1_BB = 0b001001001
+RANK_3_BB = 0b100100100
+
+
+def _advance_rank(coords: tuple[int, int], player_color: Color) -> tuple[int, int] | None:
+    # Gets the coordinate tuple of the square a pawn of `player_color` would advance to without capturing
+    new_coords = (
+        coords[0],
+        coords[1] + (1 if player_color else -1)
+    )
+
+    if new_coords[1] < 0 or new_coords[1] > 2:
+        return None
+
+    return new_coords
+
+
+def _change_file(coords: tuple[int, int], left: bool = True) -> tuple[int, int] | None:
+    # Changes the file of a coordinate tuple according to the direction specified. Left means towards a file.
+    new_coords = (
+        coords[0] + (-1 if left else 1),
+        coords[1]
+    )
+
+    if new_coords[0] < 0 or new_coords[0] > 2:
+        return None
+
+    return new_coords
+
+
+def _build_target_tables() -> tuple[tuple[tuple[int, ...], ...], tuple[tuple[int, ...], ...]]:
+    # Runs the coordinate arithmetic once for every square and color and collects the target squares of
+    # non-capturing and capturing moves as bitboards, indexed by color and square index
+    advance = ([0] * len(Squares), [0] * len(Squares))
+    capture = ([0] * len(Squares), [0] * len(Squares))
+
+    for square in Squares:
+        for color in (BLACK, WHITE):
+            if (advanced_coords := _advance_rank(square.value, color)) is None:
+                continue
+
+            advance[color][square.idx] = SQ_BY_COORDS[advanced_coords].bit
+            for left in [True, False]:
+                if (coords := _change_file(advanced_coords, left)) is not None:
+                    capture[color][square.idx] |= SQ_BY_COORDS[coords].bit
+
+    return tuple(map(tuple, advance)), tuple(map(tuple, capture))
+
+
+# bitboards of the targets of non-capturing and capturing moves, indexed by color and square index
+ADVANCE_BB, CAPTURE_BB = _build_target_tables()
+
+
+@dataclass(frozen=True, slots=True)
 class Move:
     """Move of a pawn from a square to another square"""
 
-    from_square: Squares
+    from_square: Square
     """Source square of the move"""
 
-    to_square: Squares
+    to_square: Square
     """Target square of the move"""
 
     @classmethod
     def from_uci(cls, uci: str) -> Self:
         """Creates a move from a UCI string"""
-        pattern = "([abc][1-3])([abc][1-3])"
-        match = re.match(pattern, uci.lower().strip())
+        normalized = uci.lower().strip()
 
-        if not match:
+        if len(normalized) != 4:
             raise ValueError(f"Invalid UCI string '{uci}'")
 
-        from_uci = match.group(1)
-        to_uci = match.group(2)
+        try:
+            return cls(
+                from_square=SQUARE_BY_UCI[normalized[:2]],
+                to_square=SQUARE_BY_UCI[normalized[2:]],
+            )
+        except KeyError as error:
+            raise ValueError(f"Invalid UCI string '{uci}'") from error
+
 
-        return cls(
-            from_square=Squares[from_uci.upper()],
-            to_square=Squares[to_uci.upper()],
-        )
+# symbols for the Unicode representation of the board
+_PIECE_SYMBOLS: dict[Color, str] = {WHITE: "♙ ", BLACK: "♟ "}
+_EMPTY_SQUARE_SYMBOLS = ("■ ", "□ ")  # indexed by the parity of file + rank
 
 
 class Board:
     """Describes the board state in a game of Hexapawn"""
 
+    __slots__ = ("white", "black", "turn", "zobrist", "_stack")
+
     def __init__(self):
 
-        # two-dimensional array representing the board
-        # indexing of the squares is done according to the Square enum
-        self._board: list[list[Optional[Color]]] = [[None for _ in range(3)] for _ in range(3)]
+        # bitboards of the pieces of either color, bit `file * 3 + rank` is set if the square is occupied
+        self.white: int = 0
+        """Bitboard of the white pieces"""
+
+        self.black: int = 0
+        """Bitboard of the black pieces"""
 
         self.turn: Color = WHITE
         """Indicates which player does the next move"""
 
-        self.clear().reset()
+        self.zobrist: int = 0
+        """Zobrist hash of the position, kept up to date by the methods modifying the board. Assigning the bitboards or
+        the player to move directly leaves it stale, use :meth:`set_position` instead."""
+
+        # undo records of the pushed moves, consisting of the move, the bitboard of the captured piece and the
+        # Zobrist hash before the move
+        self._stack: list[tuple[Move, int, int]] = []
+
+        self.reset()
 
     def clear(self) -> Self:
         """Removes all pieces from the board"""
-        for i, j in product(range(len(self._board)), range(len(self._board[0]))):
-            self._board[i][j] = None
-
-        return self
+        return self.set_position(0, 0, self.turn)
 
     def reset(self) -> Self:
         """Restores the starting position"""
-        for square in [Squares.A1, Squares.B1, Squares.C1]:
-            file, rank = square.value
-            self._board[file][rank] = WHITE
+        return self.set_position(RANK_1_BB, RANK_3_BB, WHITE)
 
-        for square in [Squares.A3, Squares.B3, Squares.C3]:
-            file, rank = square.value
-            self._board[file][rank] = BLACK
-
-        self.turn = WHITE
+    def set_position(self, white: int, black: int, turn: Color) -> Self:
+        """Sets up the position given by the bitboards of both colors and the player to move and forgets the pushed
+        moves"""
+        self._stack.clear()
+        self.white = white
+        self.black = black
+        self.turn = turn
+        self.zobrist = _zobrist_hash(white, black, turn)
 
         return self
 
+    def push(self, move: Move) -> None:
+        """Plays `move` for the player whose turn it is. The move is not checked for legality."""
+        self._stack.append((move, (self.white | self.black) & move.to_square.bit, self.zobrist))
+        self.zobrist ^= _zobrist_move(self.white, self.black, self.turn, move)
+        self.white, self.black, self.turn = _play(self.white, self.black, self.turn, move)
+
+    def pop(self) -> Move:
+        """Takes back the last pushed move and returns it.
+
+        Raises an `IndexError` if no move was pushed."""
+        move, captured, self.zobrist = self._stack.pop()
+        move_bits = move.from_square.bit | move.to_square.bit
+
+        self.turn = 1 - self.turn
+        if self.turn == WHITE:
+            self.white ^= move_bits
+            self.black |= captured
+        else:
+            self.black ^= move_bits
+            self.white |= captured
+
+        return move
+
     @property
     def legal_moves(self) -> Iterator[Move]:
         """Iterator of legal moves in the current state.
 
-        Wraps :meth:`generate_legal_moves` and :meth:`is_legal`"""
+        Wraps :meth:`generate_legal_moves`"""
         return self.generate_legal_moves()
 
     def generate_legal_moves(self) -> Iterator[Move]:
-        """Legal moves from the current position and for the player whose turn it is."""
-        return (
-            move for from_square, to_square in product(Squares, Squares)
-            if self.is_legal(move := Move(from_square, to_square))
-        )
+        """Legal moves from the current position and for the player whose turn it is.
+
+        The moves are cached per position, see :meth:`generate_legal_moves_uncached` for a variant that bypasses the
+        cache."""
+        return iter(_legal_moves_for(self.white, self.black, self.turn))
+
+    def generate_legal_moves_uncached(self) -> Iterator[Move]:
+        """Legal moves from the current position and for the player whose turn it is, generated without consulting
+        the cache."""
+        return _generate_legal_moves(self.white, self.black, self.turn)
 
     def is_legal(self, move: Move) -> bool:
         """Checks if the given `move` is legal in the current state of the game"""
+        own, enemy = (self.white, self.black) if self.turn else (self.black, self.white)
+        from_idx = move.from_square.idx
+        to_bit = move.to_square.bit
 
         # no piece at the source square
-        if not self.piece_at(move.from_square) == self.turn:
+        if not own & move.from_square.bit:
             return False
 
         # normal advance
-        if move.from_square.can_advance_to(move.to_square, self.turn):
-            if not self.piece_at(move.to_square):
-                return True
+        if ADVANCE_BB[self.turn][from_idx] & to_bit:
+            return not (own | enemy) & to_bit
 
         # capture move
-        if move.to_square in move.from_square.capture_candidates(self.turn):
-            if self.piece_at(move.to_square) == ~self.turn:
-                return True
+        return bool(CAPTURE_BB[self.turn][from_idx] & to_bit & enemy)
 
-        return False
+    def value(self) -> Value:
+        """Game-theoretic value of the current position for the player whose turn it is, assuming perfect play.
 
-    def piece_at(self, square: Squares) -> Color | None:
+        Hexapawn cannot end in a draw, so this is either `WIN` or `LOSS`."""
+        return _solve(self.white, self.black, self.turn)
+
+    def best_move(self) -> Move | None:
+        """A move that keeps the best achievable value for the player whose turn it is, or `None` if the game is
+        over."""
+        position = (self.white, self.black, self.turn)
+        if _is_lost(*position):
+            return None
+
+        moves = _legal_moves_for(*position)
+        return next((move for move in moves if _solve(*_play(*position, move)) == LOSS), moves[0])
+
+    def piece_at(self, square: Square) -> Color | None:
         """Returns the `Color` of the piece th the given `square` or `None` if the square is not occupied."""
-        file, rank = square.value
-        return self._board[file][rank]
+        bit = square.bit
+        return WHITE if self.white & bit else BLACK if self.black & bit else None
 
     def to_unicode(self) -> str:
         """Returns a Unicode symbol representation of the state of the board"""
-        result = ""
-        for rank in range(len(self._board[0])):
-            for file in range(len(self._board)):  # pylint: disable=consider-using-enumerate
-                entry = self._board[file][rank]
-                if entry is not None:
-                    result += "♙ " if entry == WHITE else "♟ "
-                else:
-                    result += "□ " if (file + rank) % 2 != 0 else "■ "
-            result += "\n"
-        result = result[:-1]
-        return result
+        cells = [
+            _PIECE_SYMBOLS[piece] if (piece := self.piece_at(SQ_BY_IDX[file * 3 + rank])) is not None
+            else _EMPTY_SQUARE_SYMBOLS[(file + rank) & 1]
+            for rank in range(3) for file in range(3)
+        ]
+        return "\n".join("".join(cells[rank * 3:rank * 3 + 3]) for rank in range(3))
 
     def print(self) -> None:
         """Prints a Unicode representation if the state of the board"""
         print(self.to_unicode())
+
+
+def _zobrist_hash(white: int, black: int, turn: Color) -> int:
+    # Computes the Zobrist hash of a position from scratch
+    key = 0 if turn == WHITE else _ZOBRIST_BLACK_TO_MOVE
+    for idx in iter_bits(white):
+        key ^= _ZOBRIST_PIECES[idx * 2 + WHITE]
+    for idx in iter_bits(black):
+        key ^= _ZOBRIST_PIECES[idx * 2 + BLACK]
+
+    return key
+
+
+def _zobrist_move(white: int, black: int, turn: Color, move: Move) -> int:
+    # Computes the change of the Zobrist hash when `move` is played by the player whose turn it is
+    to_idx = move.to_square.idx
+    delta = (_ZOBRIST_PIECES[move.from_square.idx * 2 + turn] ^ _ZOBRIST_PIECES[to_idx * 2 + turn]
+             ^ _ZOBRIST_BLACK_TO_MOVE)
+
+    if (black if turn == WHITE else white) & move.to_square.bit:
+        delta ^= _ZOBRIST_PIECES[to_idx * 2 + 1 - turn]
+
+    return delta
+
+
+def _play(white: int, black: int, turn: Color, move: Move) -> tuple[int, int, Color]:
+    # Returns the bitboards and the player to move after `move` was played by the player whose turn it is
+    from_bit, to_bit = move.from_square.bit, move.to_square.bit
+    if turn == WHITE:
+        return (white ^ from_bit) | to_bit, black & ~to_bit, BLACK
+    return white & ~to_bit, (black ^ from_bit) | to_bit, WHITE
+
+
+def _generate_legal_moves(white: int, black: int, turn: Color) -> Iterator[Move]:
+    # Generates the legal moves of a position by looking up the targets of every pawn of the player to move
+    own, enemy = (white, black) if turn else (black, white)
+    empty = ~(own | enemy)
+    advance, capture = ADVANCE_BB[turn], CAPTURE_BB[turn]
+
+    for from_idx in iter_bits(own):
+        from_square = SQ_BY_IDX[from_idx]
+        for to_idx in iter_bits((advance[from_idx] & empty) | (capture[from_idx] & enemy)):
+            yield Move(from_square, SQ_BY_IDX[to_idx])
+
+
+def _legal_moves_for(white: int, black: int, turn: Color) -> tuple[Move, ...]:
+    # Generates the legal moves of a position once, so all boards reaching it share the result
+    idx = pos_index(white, black, turn)
+    if (moves := _LEGAL_MOVES.get(idx)) is None:
+        moves = _LEGAL_MOVES[idx] = tuple(_generate_legal_moves(white, black, turn))
+
+    return moves
+
+
+def _is_lost(white: int, black: int, turn: Color) -> bool:
+    # The player to move has lost if an opponent pawn reached their home rank, if they have no pawns left or if they
+    # cannot move
+    if turn == WHITE:
+        if black & RANK_1_BB or not white:
+            return True
+    elif white & RANK_3_BB or not black:
+        return True
+
+    return not _legal_moves_for(white, black, turn)
+
+
+def pos_index(white: int, black: int, turn: Color) -> int:
+    """Index of the position given by the bitboards of both colors and the player to move in `[0, 2**19)`, suitable as
+    an offset into flat tables. Every position has its own index, bit patterns that are not valid positions are
+    wasted."""
+    return turn | (white << 1) | (black << 10)
+
+
+def _solve(white: int, black: int, turn: Color) -> Value:
+    # Backward induction over the game tree, which is small enough to be solved completely on first use
+    idx = pos_index(white, black, turn)
+    shift = (idx & 3) * 2
+    if code := (_VALUES[idx >> 2] >> shift) & 3:
+        return _VALUE_BY_CODE[code]
+
+    position = (white, black, turn)
+    if _is_lost(*position):
+        value = LOSS
+    elif any(_solve(*_play(*position, move)) == LOSS for move in _legal_moves_for(*position)):
+        value = WIN
+    else:
+        value = LOSS
+
+    _VALUES[idx >> 2] |= _VALUE_BY_CODE.index(value) << shift
+    return value
+
+
+# random keys for the Zobrist hash, indexed by `square index * 2 + color`, and for black being the player to move
+_zobrist_random = random.Random(0)
+_ZOBRIST_PIECES: tuple[int, ...] = tuple(_zobrist_random.getrandbits(64) for _ in range(2 * len(Squares)))
+_ZOBRIST_BLACK_TO_MOVE: int = _zobrist_random.getrandbits(64)
+del _zobrist_random
+
+# legal moves of the positions seen so far, keyed by `pos_index`
+_LEGAL_MOVES: dict[int, tuple[Move, ...]] = {}
+
+# game-theoretic values of the positions solved so far, packed into 2-bit codes indexed by `pos_index`, where code 0
+# marks positions that are not solved yet
+_VALUES = bytearray(2 ** 19 // 4)
+_VALUE_BY_CODE: tuple[Value | None, ...] = (None, WIN, LOSS)
@@ -0,0 +1,171 @@
+"""Tests the functionality of the `Board` class"""
+
+from itertools import product
+
+import pytest
+
+from hexapawn import Color, BLACK, WHITE, LOSS, WIN
+from hexapawn import Board, Move, Square, Squares, pos_index
+
+
+# pylint: disable=protected-access
+class TestBoard:
+    """Bundles the tests for the Board class"""
+
+    @pytest.mark.parametrize("square, expected", [
+        (Squares.A1, WHITE),
+        (Squares.B1, WHITE),
+        (Squares.C1, WHITE),
+        (Squares.A2, None),
+        (Squares.B2, None),
+        (Squares.C2, None),
+        (Squares.A3, BLACK),
+        (Squares.B3, BLACK),
+        (Squares.C3, BLACK),
+    ])
+    def test_starting_position(self, square: Square, expected: Color | None):
+        """Test if the starting position has the pawns on the first and last rank"""
+        assert Board().piece_at(square) == expected
+
+    def test_clear(self):
+        """Test if clearing removes all pieces"""
+        board = Board().clear()
+        assert all(board.piece_at(square) is None for square in Squares)
+
+    def test_to_unicode(self):
+        """Test the Unicode representation of the starting position"""
+        assert Board().to_unicode() == "♙ ♙ ♙ \n□ ■ □ \n♟ ♟ ♟ "
+
+    def test_legal_moves_starting_position(self):
+        """Test if white can advance each pawn in the starting position"""
+        moves = list(Board().legal_moves)
+        assert len(moves) == 3
+        assert all(Move.from_uci(uci) in moves for uci in ['a1a2', 'b1b2', 'c1c2'])
+
+    def test_legal_moves_cached(self):
+        """Test if the cached move generation agrees with the uncached one"""
+        board = Board()
+        assert list(board.generate_legal_moves()) == list(board.generate_legal_moves_uncached())
+
+    @pytest.mark.parametrize("white, black, turn, expected", [
+        ([Squares.B2], [Squares.A3, Squares.B3, Squares.C3], WHITE, ['b2a3', 'b2c3']),
+        ([Squares.A1, Squares.B2], [Squares.B3], WHITE, ['a1a2']),
+        ([Squares.A1, Squares.C2], [Squares.B3], WHITE, ['a1a2', 'c2c3', 'c2b3']),
+        ([Squares.A1, Squares.B1, Squares.C1], [Squares.B2], BLACK, ['b2a1', 'b2c1']),
+        ([Squares.A2], [Squares.A3, Squares.C3], BLACK, ['c3c2']),
+        ([Squares.B1], [Squares.C2], BLACK, ['c2c1', 'c2b1']),
+    ])
+    def test_legal_moves(self, white: list[Square], black: list[Square], turn: Color, expected: list[str]):
+        """Test move generation including captures and moves along the edges of the board"""
+        board = Board().set_position(sum(square.bit for square in white), sum(square.bit for square in black), turn)
+
+        moves = list(board.generate_legal_moves_uncached())
+        assert len(moves) == len(expected)
+        assert all(Move.from_uci(uci) in moves for uci in expected)
+
+        # `is_legal` has to agree with the move generation on every pair of squares
+        assert all(
+            board.is_legal(Move(from_square, to_square)) == (Move(from_square, to_square) in moves)
+            for from_square, to_square in product(Squares, Squares)
+        )
+
+    @pytest.mark.parametrize("uci, expected", [
+        ('b2c3', True),
+        ('b2a3', False),
+        ('b2b3', False),
+    ])
+    def test_is_legal_capture(self, uci: str, expected: bool):
+        """Regression test for captures by white after 1. b1b2 a3a2"""
+        board = Board().set_position(
+            Squares.A1.bit | Squares.B2.bit | Squares.C1.bit,
+            Squares.A2.bit | Squares.B3.bit | Squares.C3.bit,
+            WHITE,
+        )
+
+        assert board.is_legal(Move.from_uci(uci)) == expected
+
+    def test_value_starting_position(self):
+        """Test if the starting position is a loss for white, i.e. a win for the second player"""
+        assert Board().value() == LOSS
+
+    @pytest.mark.parametrize("white, black, turn, expected", [
+        ([Squares.B2], [Squares.A3], WHITE, ['b2b3', 'b2a3']),
+        ([Squares.A1, Squares.C2], [Squares.B3], BLACK, ['b3c2']),
+        ([Squares.A2], [Squares.A3], WHITE, []),
+    ])
+    def test_best_move(self, white: list[Square], black: list[Square], turn: Color, expected: list[str]):
+        """Test if the best move is one of the winning moves"""
+        board = Board().set_position(sum(square.bit for square in white), sum(square.bit for square in black), turn)
+
+        if expected:
+            assert board.value() == WIN
+            assert board.best_move() in [Move.from_uci(uci) for uci in expected]
+        else:
+            assert board.value() == LOSS
+            assert board.best_move() is None
+
+    @pytest.mark.parametrize("ucis", [
+        ['b1b2'],
+        ['b1b2', 'a3b2'],
+        ['a1a2', 'b3b2', 'a2b3'],
+    ])
+    def test_push(self, ucis: list[str]):
+        """Test if pushing moves updates the pieces, the player to move and the Zobrist hash consistently"""
+        board = Board()
+        for uci in ucis:
+            board.push(Move.from_uci(uci))
+
+        reference = Board().set_position(board.white, board.black, board.turn)
+        assert board.zobrist == reference.zobrist
+        assert board.turn == (WHITE if len(ucis) % 2 == 0 else BLACK)
+        assert board.white & board.black == 0
+        assert board.piece_at(Move.from_uci(ucis[-1]).to_square) == 1 - board.turn
+        assert board.piece_at(Move.from_uci(ucis[-1]).from_square) is None
+
+    def test_zobrist_turn(self):
+        """Test if the Zobrist hash distinguishes the player to move"""
+        board = Board()
+        assert board.zobrist != Board().set_position(board.white, board.black, BLACK).zobrist
+
+    def test_pop(self):
+        """Test if popping moves restores the previous positions including captured pieces"""
+        board = Board()
+        history = []
+        for uci in ['b1b2', 'a3b2', 'a1a2', 'b2b1']:
+            history.append((board.white, board.black, board.turn, board.zobrist))
+            board.push(Move.from_uci(uci))
+
+        for uci in reversed(['b1b2', 'a3b2', 'a1a2', 'b2b1']):
+            assert board.pop() == Move.from_uci(uci)
+            assert (board.white, board.black, board.turn, board.zobrist) == history.pop()
+
+        with pytest.raises(IndexError):
+            board.pop()
+
+    def test_pos_index(self):
+        """Test if the positions reachable from the starting position have distinct indices in the table range"""
+        board = Board()
+        positions = set()
+
+        def visit():
+            positions.add((board.white, board.black, board.turn))
+            for move in list(board.legal_moves):
+                board.push(move)
+                visit()
+                board.pop()
+
+        visit()
+        indices = {pos_index(*position) for position in positions}
+        assert len(indices) == len(positions)
+        assert all(0 <= index < 2 ** 19 for index in indices)
+
+    def test_assigned_turn_does_not_leak(self):
+        """Regression test for moves cached for a modified board being returned for other boards"""
+        board = Board()
+        board.turn = BLACK
+        assert Move.from_uci('a3a2') in list(board.legal_moves)
+
+        moves = list(Board().legal_moves)
+        assert len(moves) == 3
+        assert all(Move.from_uci(uci) in moves for uci in ['a1a2', 'b1b2', 'c1c2'])
+        assert Board().value() == LOSS
@@ -12,15 +12,23 @@ class TestMove:
         """Test if we can instantiate the class directly"""
         Move(from_square=Squares.A1, to_square=Squares.A2)
 
+    def test_immutable(self):
+        """Test if moves are hashable and cannot be modified"""
+        move = Move(from_square=Squares.A1, to_square=Squares.A2)
+        assert move in {Move(from_square=Squares.A1, to_square=Squares.A2)}
+        with pytest.raises(AttributeError):
+            move.to_square = Squares.A3  # type: ignore[misc]
+
     @pytest.mark.parametrize("uci, reference", [
         ('a1a2', Move(from_square=Squares.A1, to_square=Squares.A2)),
         ('c2b3', Move(from_square=Squares.C2, to_square=Squares.B3)),
+        (' B1B2 ', Move(from_square=Squares.B1, to_square=Squares.B2)),
     ])
     def test_from_uci(self, uci: str, reference: Move):
         """Test UCI factory"""
         assert Move.from_uci(uci) == reference
 
-    @pytest.mark.parametrize("uci", ['a3a4', 'c2d3'])
+    @pytest.mark.parametrize("uci", ['a3a4', 'c2d3', 'a1', 'a1a2a3', 'a1a2x'])
     def test_from_invalid_uci(self, uci: str):
         """Test if the UCI factory properly fails on invalid commands"""
         with pytest.raises(ValueError):
@@ -1,22 +1,61 @@
-"""Tests the functionality of the `Squares` enum"""
+"""Tests the functionality of the `Square` class and the `Squares` namespace"""
+
+import copy
+import pickle
 
 import pytest
 
 from hexapawn import Color, BLACK, WHITE
-from hexapawn import Squares
+from hexapawn import SQ_BY_IDX, Square, Squares, iter_bits, iter_squares
+from hexapawn import _advance_rank
 
 
 # pylint: disable=protected-access
 class TestSquares:
-    """Bundles the tests for the Squares enum"""
+    """Bundles the tests for the squares of the board"""
 
     def test_corners_present(self):
-        """Test if the corner squares are present in the enum"""
+        """Test if the corner squares are present in `Squares`"""
         _ = Squares.A1
         _ = Squares.C1
         _ = Squares.C3
         _ = Squares.A3
 
+    def test_iterate(self):
+        """Test if iterating `Squares` yields all squares once, ordered like the bitboard"""
+        assert list(Squares) == list(SQ_BY_IDX)
+        assert len(set(Squares)) == len(Squares) == 9
+        assert all(isinstance(square, Square) for square in Squares)
+
+    @pytest.mark.parametrize("square", list(SQ_BY_IDX))
+    def test_copy_is_identical(self, square: Square):
+        """Test if copying or unpickling a square resolves to the same member of `Squares`"""
+        assert copy.deepcopy(square) is square
+        assert pickle.loads(pickle.dumps(square)) is square
+
+    @pytest.mark.parametrize("square, index", [
+        (Squares.A1, 0),
+        (Squares.A3, 2),
+        (Squares.B2, 4),
+        (Squares.C1, 6),
+        (Squares.C3, 8),
+    ])
+    def test_bitboard_index(self, square: Square, index: int):
+        """Test if the squares are laid out on the bitboard by file and rank"""
+        assert square.idx == index
+        assert square.bit == 1 << index
+        assert SQ_BY_IDX[index] is square
+
+    @pytest.mark.parametrize("bitboard, indices", [
+        (0, []),
+        (0b1, [0]),
+        (0b100100100, [2, 5, 8]),
+        (0b111111111, list(range(9))),
+    ])
+    def test_iter_bits(self, bitboard: int, indices: list[int]):
+        """Test if the set bits of a bitboard are iterated in ascending order"""
+        assert list(iter_bits(bitboard)) == indices
+
     @pytest.mark.parametrize("source_square, destination_square, player_color", [
         (Squares.A1, Squares.A2, WHITE),
         (Squares.B1, Squares.B2, WHITE),
@@ -31,9 +70,9 @@ class TestSquares:
         (Squares.B2, Squares.B1, BLACK),
         (Squares.C2, Squares.C1, BLACK),
     ])
-    def test_advance_rank(self, source_square: Squares, destination_square: Squares, player_color: Color):
+    def test_advance_rank(self, source_square: Square, destination_square: Square, player_color: Color):
         """Tests if the index arithmetic in `_advance_rank` produces correct results"""
-        assert Squares._advance_rank(source_square.value, player_color) == destination_square.value
+        assert _advance_rank(source_square.value, player_color) == destination_square.value
 
     @pytest.mark.parametrize("source_square, player_color", [
         (Squares.A3, WHITE),
@@ -43,9 +82,9 @@ class TestSquares:
         (Squares.B1, BLACK),
         (Squares.C1, BLACK)
     ])
-    def test_advance_rank_edge(self, source_square: Squares, player_color: Color):
+    def test_advance_rank_edge(self, source_square: Square, player_color: Color):
         """Test if we get None if we try to advance off the board's edge"""
-        assert Squares._advance_rank(source_square.value, player_color) is None
+        assert _advance_rank(source_square.value, player_color) is None
 
     @pytest.mark.parametrize("player_color, source_square, target_square, expected", (
         (WHITE, Squares.B1, Squares.B2, True),
@@ -57,7 +96,7 @@ class TestSquares:
         (BLACK, Squares.B3, Squares.C3, False),
         (BLACK, Squares.B2, Squares.B1, True)
     ))
-    def test_can_advance_to(self, player_color: Color, source_square: Squares, target_square: Squares, expected: bool):
+    def test_can_advance_to(self, player_color: Color, source_square: Square, target_square: Square, expected: bool):
         """Checks if `Squares` properly determines which moves are regular advances."""
         assert source_square.can_advance_to(target_square, player_color) == expected
 
@@ -81,6 +120,6 @@ class TestSquares:
         (BLACK, Squares.C2, {Squares.B1}),
         (BLACK, Squares.C3, {Squares.B2}),
     ])
-    def test_capture_candidates(self, player_color: Color, starting_square: Squares, candidates: set[Squares]):
+    def test_capture_candidates(self, player_color: Color, starting_square: Square, candidates: set[Square]):
         """Test if we get the right capture candidates"""
-        assert starting_square.capture_candidates(player_color) == candidates
+        assert set(iter_squares(starting_square.capture_candidates(player_color))) == candidates